@@ -0,0 +1,138 @@
+"""
+Admission control for API requests.
+
+Each worker admits a bounded number of requests at once so bursts queue in
+the process instead of piling up on the database connection pool. Waiting
+requests are served by lane priority (QR scans and health checks first, bulk
+lists last), bulk requests may only hold part of the slots, and a request is
+turned away with 503 and Retry-After when its lane's queue is full or it has
+waited too long.
+"""
+import time
+import threading
+from collections import deque
+from flask import request, jsonify, g
+
+# Lanes in priority order
+LANES = ('critical', 'default', 'bulk')
+DEFAULT_LANE = 'default'
+
+
+class AdmissionController:
+    """Bounded in-flight slots shared by prioritized FIFO lanes"""
+
+    def __init__(self, max_in_flight, max_queue, queue_timeout, bulk_limit=None):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        # Bulk requests leave the remaining slots to scans and writes
+        self.bulk_limit = bulk_limit or max(1, max_in_flight // 2)
+
+        self._cond = threading.Condition()
+        self._waiting = {lane: deque() for lane in LANES}
+        self._in_flight = dict.fromkeys(LANES, 0)
+        self._admitted = dict.fromkeys(LANES, 0)
+        self._rejected = dict.fromkeys(LANES, 0)
+        self._timed_out = dict.fromkeys(LANES, 0)
+        self._max_queued = 0
+
+    def _has_slot(self, lane):
+        if sum(self._in_flight.values()) >= self.max_in_flight:
+            return False
+        return lane != 'bulk' or self._in_flight['bulk'] < self.bulk_limit
+
+    def _may_start(self, lane, ticket):
+        """Whether the waiter holding ticket is next in line for a slot"""
+        for other in LANES[:LANES.index(lane)]:
+            if self._waiting[other]:
+                return False
+        return self._waiting[lane][0] is ticket and self._has_slot(lane)
+
+    def acquire(self, lane):
+        """Take a slot in lane, waiting if needed; False if the request is shed"""
+        with self._cond:
+            queue = self._waiting[lane]
+            if len(queue) >= self.max_queue:
+                self._rejected[lane] += 1
+                return False
+
+            ticket = object()
+            queue.append(ticket)
+            self._max_queued = max(self._max_queued,
+                                   sum(len(q) for q in self._waiting.values()))
+            deadline = time.monotonic() + self.queue_timeout
+
+            while not self._may_start(lane, ticket):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    queue.remove(ticket)
+                    self._timed_out[lane] += 1
+                    # The next waiter may be able to start in our place
+                    self._cond.notify_all()
+                    return False
+                self._cond.wait(remaining)
+
+            queue.popleft()
+            self._in_flight[lane] += 1
+            self._admitted[lane] += 1
+            # A waiter of another lane may also fit in the remaining slots
+            self._cond.notify_all()
+            return True
+
+    def release(self, lane):
+        with self._cond:
+            self._in_flight[lane] -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        """Current queue depth, in-flight requests and shedding counters per lane"""
+        with self._cond:
+            return {
+                'max_in_flight': self.max_in_flight,
+                'bulk_limit': self.bulk_limit,
+                'max_queue': self.max_queue,
+                'queue_timeout': self.queue_timeout,
+                'in_flight': sum(self._in_flight.values()),
+                'queued': sum(len(q) for q in self._waiting.values()),
+                'max_queued': self._max_queued,
+                'lanes': {lane: {
+                    'in_flight': self._in_flight[lane],
+                    'queued': len(self._waiting[lane]),
+                    'admitted': self._admitted[lane],
+                    'rejected': self._rejected[lane],
+                    'timed_out': self._timed_out[lane],
+                } for lane in LANES},
+            }
+
+
+def init_admission(app, lanes, max_in_flight, max_queue, queue_timeout,
+                   retry_after=1, bulk_limit=None):
+    """Admit requests of app through an AdmissionController
+
+    lanes maps endpoint names to lane names; other endpoints use the default
+    lane. Requests that match no route and CORS preflights are not queued.
+    """
+    controller = AdmissionController(max_in_flight, max_queue, queue_timeout,
+                                     bulk_limit)
+
+    @app.before_request
+    def admit_request():
+        if request.endpoint is None or request.method == 'OPTIONS':
+            return None
+
+        lane = lanes.get(request.endpoint, DEFAULT_LANE)
+        if not controller.acquire(lane):
+            response = jsonify({'error': 'Server is busy, please retry shortly'})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        g.admission_lane = lane
+        return None
+
+    @app.teardown_request
+    def release_request(exc):
+        lane = g.pop('admission_lane', None)
+        if lane is not None:
+            controller.release(lane)
+
+    return controller
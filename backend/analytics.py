@@ -0,0 +1,137 @@
+"""
+Collection analytics computed over the full placement history.
+
+The history is loaded with one joined query into columnar numpy arrays and
+all statistics are computed with vectorized group-by operations. Results are
+cached until the next write flushed through the session factory.
+"""
+from datetime import date
+import numpy as np
+from models import Plant, Pot, Soil, PlantPotHistory, Taxon
+from cache import CommitInvalidatedCache
+
+
+def load_placements(session):
+    """Load every placement joined with its plant, genus, pot and soil as columns"""
+    rows = session.query(
+        PlantPotHistory.plant_id,
+        PlantPotHistory.pot_id,
+        PlantPotHistory.start_date,
+        PlantPotHistory.end_date,
+        Taxon.name,
+        Plant.status,
+        Pot.room,
+        Soil.name,
+    ).join(
+        Plant, PlantPotHistory.plant_id == Plant.id
+    ).join(
+        Taxon, Plant.genus_id == Taxon.id
+    ).join(
+        Pot, PlantPotHistory.pot_id == Pot.id
+    ).join(
+        Soil, PlantPotHistory.soil_id == Soil.id
+    ).all()
+
+    plant_id, pot_id, start, end, genus, status, room, soil = (
+        zip(*rows) if rows else ([],) * 8)
+
+    return {
+        'plant_id': np.array(plant_id, dtype=np.int64),
+        'pot_id': np.array(pot_id, dtype=np.int64),
+        'start_date': np.array(start, dtype='datetime64[D]'),
+        'end_date': np.array([d if d else 'NaT' for d in end], dtype='datetime64[D]'),
+        'genus': np.array(genus, dtype=object),
+        'removed': np.array(status, dtype=object) == 'removed',
+        'room': np.array(room, dtype=object),
+        'soil': np.array(soil, dtype=object),
+    }
+
+
+def _group_mean(keys, values):
+    """Mean and count of values per distinct key"""
+    labels, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(labels))
+    sums = np.bincount(inverse, weights=values, minlength=len(labels))
+    return labels, sums / np.maximum(counts, 1), counts
+
+
+def repot_intervals_by_genus(cols):
+    """Average days between consecutive placements of a plant, per genus"""
+    order = np.lexsort((cols['start_date'], cols['plant_id']))
+    plant_id = cols['plant_id'][order]
+    start = cols['start_date'][order]
+
+    # Consecutive rows of the same plant form one repot interval
+    same_plant = plant_id[1:] == plant_id[:-1]
+    intervals = (start[1:] - start[:-1]).astype(np.int64)[same_plant]
+    genus = cols['genus'][order][1:][same_plant]
+
+    labels, means, counts = _group_mean(genus, intervals)
+    return [{'genus': g, 'average_days': round(float(m), 1), 'repots': int(n)}
+            for g, m, n in zip(labels, means, counts)]
+
+
+def soil_survival(cols):
+    """Active vs removed plants grouped by the soil of their last placement"""
+    order = np.lexsort((cols['start_date'], cols['plant_id']))
+    plant_id = cols['plant_id'][order]
+
+    # The last row of each plant run is its latest placement
+    last = np.ones(len(plant_id), dtype=bool)
+    last[:-1] = plant_id[1:] != plant_id[:-1]
+    soil = cols['soil'][order][last]
+    removed = cols['removed'][order][last]
+
+    labels, inverse = np.unique(soil, return_inverse=True)
+    plants = np.bincount(inverse, minlength=len(labels))
+    removed_counts = np.bincount(inverse, weights=removed, minlength=len(labels))
+
+    return [{'soil': s, 'plants': int(n), 'removed': int(r), 'active': int(n - r),
+             'survival_rate': round(1 - r / n, 3)}
+            for s, n, r in zip(labels, plants, removed_counts)]
+
+
+def pot_turnover_by_room(cols, today=None):
+    """Placements per pot and average placement length in days, per room"""
+    today = np.datetime64(today or date.today(), 'D')
+    end = np.where(np.isnat(cols['end_date']), today, cols['end_date'])
+    durations = (end - cols['start_date']).astype(np.int64)
+
+    labels, mean_days, placements = _group_mean(cols['room'], durations)
+
+    # Distinct pots per room from the unique (room, pot) pairs
+    room_idx = np.searchsorted(labels, cols['room'])
+    pairs = np.unique(np.stack([room_idx, cols['pot_id']]), axis=1)
+    pots = np.bincount(pairs[0], minlength=len(labels)) if pairs.size else placements
+
+    return [{'room': r, 'pots': int(p), 'placements': int(n),
+             'placements_per_pot': round(n / max(p, 1), 2),
+             'average_days': round(float(m), 1)}
+            for r, p, n, m in zip(labels, pots, placements, mean_days)]
+
+
+class CollectionAnalytics:
+    """Caches the analytics report until the next write"""
+
+    def __init__(self, session_factory):
+        self.Session = session_factory
+        self._cache = CommitInvalidatedCache(session_factory)
+
+    def report(self):
+        # Open placements are measured up to today, so the day is part of the key
+        today = date.today()
+        return self._cache.get(today, lambda: self._compute(today))
+
+    def _compute(self, today):
+        session = self.Session()
+        try:
+            cols = load_placements(session)
+        finally:
+            session.close()
+
+        return {
+            'placements': int(len(cols['plant_id'])),
+            'repot_intervals_by_genus': repot_intervals_by_genus(cols),
+            'soil_survival': soil_survival(cols),
+            'pot_turnover_by_room': pot_turnover_by_room(cols, today),
+        }
@@ -0,0 +1,48 @@
+"""
+Reference data for the form pages, fetched in one request.
+
+Each view lists the sections its form needs. Payloads are built from a few
+lean Core queries, cached until the next write and tagged with a
+content hash, so clients revalidating with If-None-Match usually get a 304
+without touching the database.
+"""
+import json
+import hashlib
+import read_models
+from cache import CommitInvalidatedCache
+
+BOOTSTRAP_SECTIONS = {
+    'pots': read_models.pot_summaries,
+    'soils': lambda session: [soil.to_dict() for soil in read_models.list_soils(session)],
+    'suggestions': read_models.name_suggestions,
+}
+
+# Sections needed by each form page
+BOOTSTRAP_VIEWS = {
+    'add_plant': ('pots', 'soils', 'suggestions'),
+    'move_plant': ('pots', 'soils'),
+}
+
+
+class FormBootstrap:
+    """Caches each view's payload and ETag until the next write"""
+
+    def __init__(self, session_factory):
+        self.Session = session_factory
+        self._cache = CommitInvalidatedCache(session_factory)
+
+    def view(self, name):
+        """Return (payload, etag) for the view; raises KeyError if unknown"""
+        sections = BOOTSTRAP_VIEWS[name]
+        return self._cache.get(name, lambda: self._compute(sections))
+
+    def _compute(self, sections):
+        session = self.Session()
+        try:
+            payload = {section: BOOTSTRAP_SECTIONS[section](session)
+                       for section in sections}
+        finally:
+            session.close()
+
+        body = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return payload, hashlib.sha1(body.encode()).hexdigest()
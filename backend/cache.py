@@ -0,0 +1,41 @@
+"""
+In-process cache of values computed from the database.
+
+Entries are dropped whenever a session of the watched sessionmaker flushes or
+commits. A value is only stored if no flush or commit happened while it was
+computed: a computation running between another session's flush and commit
+reads the old committed data, and must not outlive that commit.
+"""
+import threading
+from sqlalchemy import event
+
+
+class CommitInvalidatedCache:
+    """Caches computed values until the next write through session_factory"""
+
+    def __init__(self, session_factory):
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._values = {}
+        event.listen(session_factory, 'after_flush', self._invalidate)
+        event.listen(session_factory, 'after_commit', self._invalidate)
+
+    def _invalidate(self, session, *args):
+        with self._lock:
+            self._generation += 1
+            self._values.clear()
+
+    def get(self, key, compute):
+        """Return the cached value for key, computing it with compute() if needed"""
+        with self._lock:
+            generation = self._generation
+            if key in self._values:
+                return self._values[key]
+
+        value = compute()
+
+        with self._lock:
+            # A write during the computation leaves the value uncached
+            if generation == self._generation:
+                self._values[key] = value
+        return value
@@ -0,0 +1,205 @@
+"""
+SQL query budgets for every API route.
+
+Runs each route of app.py against an in-memory SQLite database seeded at two
+sizes and counts the SQL statements it issues through SQLAlchemy events. The
+check fails when a route has no declared budget, goes over its budget, or
+issues more statements on the larger data set (an N+1 pattern).
+
+Usage: python check_query_budgets.py
+"""
+import os
+import sys
+import logging
+import tempfile
+from datetime import date, timedelta
+
+# Must be set before app.py creates its engine and QR storage
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ['QR_STORAGE_DIR'] = tempfile.mkdtemp(prefix='qrcodes-')
+
+logging.disable(logging.INFO)
+import app as api
+logging.disable(logging.NOTSET)
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+from models import Base, Plant, Pot, Soil, PlantPotHistory
+from taxonomy import apply_taxonomy
+
+# Seed sizes compared against each other
+SMALL_SCALE = 5
+LARGE_SCALE = 40
+
+# Maximum number of SQL statements per request, by endpoint
+QUERY_BUDGETS = {
+    'get_plants': 2,
+    'get_plant': 4,
+    # Looks up the taxa at once, then interns the two new ones
+    'add_plant': 9,
+    'update_plant': 3,
+    # Locks the bare plant row, then reads its taxa unlocked
+    'remove_plant': 6,
+    'get_pots': 2,
+    'get_pots_batch': 5,
+    'get_pot_by_qr': 5,
+    'add_pot': 3,
+    'update_pot': 3,
+    'delete_pot': 3,
+    'get_rooms': 1,
+    'get_room_contents': 2,
+    'get_soils': 1,
+    'add_soil': 2,
+    'update_soil': 3,
+    'delete_soil': 2,
+    'get_plant_history': 2,
+    'move_plant': 10,
+    'get_plants_v2': 5,
+    'get_pots_v2': 5,
+    'get_analytics': 1,
+    'get_taxonomy': 6,
+    'get_bootstrap': 4,
+    'serve_qr_code': 0,
+    'health_check': 0,
+    'get_admission_stats': 0,
+    'static': 0,
+}
+
+# One representative request per endpoint: (method, path, json body)
+ROUTE_REQUESTS = {
+    'get_plants': ('GET', '/api/plants', None),
+    'get_plant': ('GET', '/api/plants/1', None),
+    'add_plant': ('POST', '/api/plants', {
+        'name': 'Budget Plant', 'family': 'Araceae', 'genus': 'Monstera',
+        'species': 'deliciosa', 'size': 'small'}),
+    'update_plant': ('PUT', '/api/plants/1', {'notes': 'Budget check'}),
+    'remove_plant': ('DELETE', '/api/plants/1', {'removed_reason': 'Budget check'}),
+    'get_pots': ('GET', '/api/pots', None),
+    'get_pots_batch': ('GET', '/api/pots/batch?qr=POT-000,POT-001,POT-002', None),
+    'get_pot_by_qr': ('GET', '/api/pots/POT-000', None),
+    'add_pot': ('POST', '/api/pots', {'room': 'Budget Room', 'size': '12 cm'}),
+    'update_pot': ('PUT', '/api/pots/2', {'notes': 'Budget check'}),
+    'delete_pot': ('DELETE', '/api/pots/1', None),  # the empty pot
+    'get_rooms': ('GET', '/api/rooms', None),
+    'get_room_contents': ('GET', '/api/rooms/Room 0/contents', None),
+    'get_soils': ('GET', '/api/soils', None),
+    'add_soil': ('POST', '/api/soils', {'name': 'Budget Mix', 'composition': 'bark'}),
+    'update_soil': ('PUT', '/api/soils/1', {'composition': 'bark, perlite'}),
+    'delete_soil': ('DELETE', '/api/soils/1', None),
+    'get_plant_history': ('GET', '/api/history/1', None),
+    'move_plant': ('POST', '/api/move', {'plant_id': 1, 'pot_id': 3, 'soil_id': 2}),
+    'get_plants_v2': ('GET', '/api/v2/plants', None),
+    'get_pots_v2': ('GET', '/api/v2/pots', None),
+    'get_analytics': ('GET', '/api/analytics', None),
+    'get_taxonomy': ('GET', '/api/taxonomy', None),
+    'get_bootstrap': ('GET', '/api/bootstrap?view=add_plant', None),
+    'serve_qr_code': ('GET', '/qrcodes/missing.png', None),
+    'health_check': ('GET', '/api/health', None),
+    'get_admission_stats': ('GET', '/api/health/admission', None),
+    'static': ('GET', '/static/qrcodes/missing.png', None),
+}
+
+
+def seed(session, scale):
+    """Seed a collection whose every dimension grows with scale
+
+    Plant 1 has moved through every pot and soil, and pot 2 (POT-000) holds
+    'scale' plants, so per-plant and per-pot routes see growing data too.
+    Pot 1 stays empty so it can be deleted.
+    """
+    session.add(Pot(qr_code_id="POT-EMPTY", room="Room 0", size="10 cm"))
+    session.flush()
+
+    soils = [Soil(name=f"Mix {i}", composition=f"{i}0% bark") for i in range(scale)]
+    pots = [Pot(qr_code_id=f"POT-{i:03d}", room=f"Room {i % 4}", size="15 cm")
+            for i in range(scale)]
+    plants = [Plant(name=f"Plant {i}", size="medium") for i in range(2 * scale)]
+    for i, plant in enumerate(plants):
+        apply_taxonomy(session, plant, {
+            'family': "Araceae", 'genus': f"Genus {i % 3}", 'species': f"species {i}"})
+    session.add_all(soils + pots + plants)
+    session.flush()
+
+    start = date(2020, 1, 1)
+    subject = plants[0]
+    # Walk the first plant backwards through the pots so it ends up in POT-000
+    for step, pot in enumerate(reversed(pots)):
+        session.add(PlantPotHistory(
+            plant_id=subject.id, pot_id=pot.id, soil_id=soils[step].id,
+            start_date=start + timedelta(days=30 * step),
+            end_date=None if step == scale - 1 else start + timedelta(days=30 * (step + 1))))
+
+    for i, plant in enumerate(plants[1:], start=1):
+        pot = pots[0] if i < scale else pots[i % scale]
+        session.add(PlantPotHistory(
+            plant_id=plant.id, pot_id=pot.id, soil_id=soils[i % scale].id,
+            start_date=start))
+    session.commit()
+
+
+def use_fresh_database(scale, engine=None):
+    """Point the app at a freshly seeded database (in-memory SQLite by default)"""
+    if engine is None:
+        engine = create_engine('sqlite://', poolclass=StaticPool,
+                               connect_args={'check_same_thread': False})
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    api.Session.configure(bind=engine)
+
+    session = api.Session()
+    try:
+        seed(session, scale)
+    finally:
+        session.close()
+    return engine
+
+
+def count_queries(endpoint, scale):
+    """Run the endpoint's request on fresh data and count its SQL statements"""
+    engine = use_fresh_database(scale)
+    statements = []
+    event.listen(engine, 'before_cursor_execute',
+                 lambda conn, cursor, sql, *args: statements.append(sql))
+
+    method, path, body = ROUTE_REQUESTS[endpoint]
+    response = api.app.test_client().open(path, method=method, json=body)
+    engine.dispose()
+    return len(statements), response.status_code
+
+
+def main():
+    endpoints = sorted(rule.endpoint for rule in api.app.url_map.iter_rules())
+    failures = []
+
+    for endpoint in endpoints:
+        if endpoint not in QUERY_BUDGETS or endpoint not in ROUTE_REQUESTS:
+            failures.append(f"{endpoint}: no query budget declared")
+            continue
+
+        small, status = count_queries(endpoint, SMALL_SCALE)
+        large, _ = count_queries(endpoint, LARGE_SCALE)
+        budget = QUERY_BUDGETS[endpoint]
+        print(f"{endpoint:<20} status {status}  queries {small:>3} / {large:>3}  budget {budget}")
+
+        if status >= 500:
+            failures.append(f"{endpoint}: request failed with status {status}")
+        if large > small:
+            failures.append(
+                f"{endpoint}: {small} queries at scale {SMALL_SCALE} but "
+                f"{large} at scale {LARGE_SCALE}")
+        if max(small, large) > budget:
+            failures.append(
+                f"{endpoint}: {max(small, large)} queries, budget is {budget}")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    print(f"\nOK: {len(endpoints)} routes within their query budgets")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
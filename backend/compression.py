@@ -0,0 +1,81 @@
+"""
+Response compression negotiated from the Accept-Encoding header.
+
+Brotli is used when the optional 'brotli' package is installed and the client
+accepts it, gzip otherwise. Small and already encoded responses are sent as is.
+"""
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this gain little and cost a compression call
+MIN_COMPRESS_SIZE = 500
+COMPRESSIBLE_MIMETYPES = {'application/json', 'image/svg+xml', 'text/plain'}
+
+
+def choose_encoding(accept_encoding):
+    """Pick 'br', 'gzip' or None from an Accept-Encoding header"""
+    accepted, refused = set(), set()
+    for part in accept_encoding.split(','):
+        coding, *params = part.split(';')
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        # q=0 explicitly refuses a coding, even when '*' accepts the rest
+        (accepted if quality > 0 else refused).add(coding)
+
+    def acceptable(coding):
+        if coding in accepted:
+            return True
+        return '*' in accepted and coding not in refused
+
+    if brotli is not None and acceptable('br'):
+        return 'br'
+    if acceptable('gzip'):
+        return 'gzip'
+    return None
+
+
+def compress_response(response):
+    """Compress an eligible response in place"""
+    if (response.direct_passthrough
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+
+    encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=5))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(data, compresslevel=6))
+    else:
+        return response
+
+    response.headers['Content-Encoding'] = encoding
+    # The encoded bytes differ from what a strong ETag was computed over
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Compress responses of the app according to Accept-Encoding"""
+    app.after_request(compress_response)
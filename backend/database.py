@@ -0,0 +1,65 @@
+"""
+Engine setup shared by the app and scripts.
+
+MySQL URLs get a plain engine. SQLite URLs get the embedded single-node mode:
+WAL journaling so readers never block the writer, tuned pragmas applied on
+every pooled connection, and explicit BEGIN handling so write transactions
+take the write lock up front and wait for it instead of failing mid-way.
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    # Safe with WAL: a power loss may drop the last commits, never corrupt
+    'synchronous': 'NORMAL',
+    'foreign_keys': 'ON',
+    'busy_timeout': 5000,
+    # Negative cache_size is in KiB: 64 MiB page cache per connection
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def is_sqlite(url):
+    return make_url(url).get_backend_name() == 'sqlite'
+
+
+def create_database_engine(url, write_intent=None, **kwargs):
+    """Create the engine for url, tuning it when it points to SQLite
+
+    write_intent is an optional callable telling whether the transaction being
+    started will write; such transactions begin with BEGIN IMMEDIATE.
+    """
+    if not is_sqlite(url):
+        return create_engine(url, **kwargs)
+
+    database = make_url(url).database
+    if not database or database == ':memory:':
+        # Every connection to an in-memory database would get its own copy
+        kwargs.setdefault('poolclass', StaticPool)
+    kwargs.setdefault('connect_args', {})['check_same_thread'] = False
+
+    engine = create_engine(url, **kwargs)
+
+    @event.listens_for(engine, 'connect')
+    def apply_pragmas(dbapi_connection, connection_record):
+        # Stop pysqlite from issuing its own BEGIN so the one below is used
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+        cursor.close()
+
+    @event.listens_for(engine, 'begin')
+    def begin(connection):
+        if write_intent is not None and write_intent():
+            # Take the single write lock now; a deferred transaction that
+            # upgrades to writing later fails instead of waiting
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+        else:
+            connection.exec_driver_sql('BEGIN')
+
+    return engine
@@ -0,0 +1,297 @@
+"""
+Closed-loop load test of a running backend with a realistic traffic mix.
+
+Virtual users each send one request at a time, picking the route from a
+weighted mix, waiting for the response and pausing for a think time before the
+next one. Fixtures (a soil, pots and plants placed in them) are created
+through the API first, so moves and scans only touch load test data; created
+pots stay in the 'Load Test' room afterwards.
+
+Throughput, p50/p95/p99 latency and error rate are reported per route and
+saved as JSON; pass an earlier result as --baseline to print the changes.
+
+Usage: python load_test.py [--url URL] [--users N] [--duration S]
+                           [--mix scan=60,plants=15,move=15,add_pot=10]
+                           [--output FILE] [--baseline FILE]
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import http.client
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, quote
+
+DEFAULT_MIX = 'scan=60,plants=15,move=15,add_pot=10'
+FIXTURE_ROOM = 'Load Test'
+
+
+class Client:
+    """One keep-alive HTTP connection, reopened when the server closes it"""
+
+    def __init__(self, base_url, timeout):
+        url = urlsplit(base_url)
+        connection_class = (http.client.HTTPSConnection if url.scheme == 'https'
+                            else http.client.HTTPConnection)
+        self._connect = lambda: connection_class(url.hostname, url.port, timeout=timeout)
+        self._conn = None
+
+    def request(self, method, path, payload=None):
+        """Send a JSON request and return (status, body bytes)"""
+        body = json.dumps(payload) if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = self._connect()
+            try:
+                self._conn.request(method, path, body=body, headers=headers)
+                resp = self._conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError,
+                    ConnectionResetError):
+                # A kept-alive connection the server already dropped
+                self.close()
+                if attempt:
+                    raise
+                continue
+            if resp.will_close:
+                self.close()
+            return resp.status, data
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def parse_mix(spec):
+    """Parse 'scan=60,plants=15' into {route: weight}"""
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route '{name}', expected one of {', '.join(ROUTES)}")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"Weight of '{name}' is not a number: '{weight}'") from None
+        if not 0 <= mix[name] < float('inf'):
+            raise ValueError(f"Weight of '{name}' must be zero or positive: '{weight}'")
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one route with a positive weight")
+    return mix
+
+
+def positive_int(value):
+    """argparse type of counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a whole number") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def expect(status, data, what):
+    if status >= 400:
+        raise RuntimeError(f"Could not create {what}: {status} {data[:200]!r}")
+    return json.loads(data)
+
+
+def setup_fixtures(base_url, pots, plants):
+    """Create the soil, pots and placed plants the virtual users work on"""
+    client = Client(base_url, timeout=30)
+    try:
+        soil = expect(*client.request('POST', '/api/soils', {
+            'name': 'Load Test Mix', 'composition': 'load test'}), 'soil')
+        pot_list = [expect(*client.request('POST', '/api/pots', {
+            'room': FIXTURE_ROOM, 'size': '12 cm'}), 'pot') for _ in range(pots)]
+        plant_ids = []
+        for i in range(plants):
+            plant = expect(*client.request('POST', '/api/plants', {
+                'name': f'Load Test Plant {i}', 'family': 'Araceae',
+                'genus': 'Monstera', 'species': 'deliciosa', 'size': 'small'}), 'plant')
+            expect(*client.request('POST', '/api/move', {
+                'plant_id': plant['id'], 'pot_id': pot_list[i % pots]['id'],
+                'soil_id': soil['id']}), 'placement')
+            plant_ids.append(plant['id'])
+    finally:
+        client.close()
+
+    return {
+        'soil_id': soil['id'],
+        'pot_ids': [pot['id'] for pot in pot_list],
+        'qr_codes': [pot['qr_code_id'] for pot in pot_list],
+        'plant_ids': plant_ids,
+    }
+
+
+# Request builders of the routes in the mix: (fixtures, rng) -> (method, path, json body)
+ROUTES = {
+    'scan': lambda fx, rng: (
+        'GET', f"/api/pots/{quote(rng.choice(fx['qr_codes']))}", None),
+    'plants': lambda fx, rng: ('GET', '/api/plants', None),
+    'move': lambda fx, rng: ('POST', '/api/move', {
+        'plant_id': rng.choice(fx['plant_ids']),
+        'pot_id': rng.choice(fx['pot_ids']),
+        'soil_id': fx['soil_id']}),
+    'add_pot': lambda fx, rng: ('POST', '/api/pots', {
+        'room': FIXTURE_ROOM, 'size': '12 cm'}),
+}
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples, elapsed):
+    """Aggregate (latency seconds, status) samples into a route report"""
+    latencies = sorted(latency for latency, _ in samples)
+    statuses = Counter(status for _, status in samples)
+    errors = sum(n for status, n in statuses.items() if status == 0 or status >= 400)
+    ms = lambda value: round(value * 1000, 2) if value is not None else None
+    return {
+        'requests': len(samples),
+        'throughput': round(len(samples) / elapsed, 2) if elapsed else 0,
+        'error_rate': round(errors / len(samples), 4) if samples else 0,
+        'statuses': {str(status): n for status, n in sorted(statuses.items())},
+        'latency_ms': {
+            'mean': ms(sum(latencies) / len(latencies)) if latencies else None,
+            'p50': ms(percentile(latencies, 50)),
+            'p95': ms(percentile(latencies, 95)),
+            'p99': ms(percentile(latencies, 99)),
+            'max': ms(latencies[-1]) if latencies else None,
+        },
+    }
+
+
+def run(args):
+    mix = parse_mix(args.mix)
+    routes, weights = list(mix), list(mix.values())
+
+    print(f"Creating fixtures: {args.pots} pots, {args.plants} plants...")
+    fixtures = setup_fixtures(args.url, args.pots, args.plants)
+
+    samples = {route: [] for route in routes}
+    lock = threading.Lock()
+    started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    start = time.monotonic()
+    measure_from = start + args.warmup
+    stop_at = measure_from + args.duration
+
+    def virtual_user(user_id):
+        rng = random.Random(args.seed * 1000 + user_id)
+        client = Client(args.url, args.timeout)
+        try:
+            while True:
+                sent = time.monotonic()
+                if sent >= stop_at:
+                    return
+                route = rng.choices(routes, weights)[0]
+                method, path, payload = ROUTES[route](fixtures, rng)
+                try:
+                    status, _ = client.request(method, path, payload)
+                except OSError:
+                    # Connection refused, reset or timed out
+                    client.close()
+                    status = 0
+                done = time.monotonic()
+                if sent >= measure_from:
+                    with lock:
+                        samples[route].append((done - sent, status))
+                if args.think_time:
+                    time.sleep(rng.expovariate(1000 / args.think_time))
+        finally:
+            client.close()
+
+    print(f"Running {args.users} virtual users for {args.duration}s "
+          f"(+{args.warmup}s warm-up), mix {args.mix}")
+    users = [threading.Thread(target=virtual_user, args=(n,)) for n in range(args.users)]
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+
+    elapsed = args.duration
+    all_samples = [sample for route in routes for sample in samples[route]]
+    return {
+        'started_at': started_at,
+        'config': {
+            'url': args.url, 'users': args.users, 'duration': args.duration,
+            'warmup': args.warmup, 'think_time_ms': args.think_time,
+            'mix': mix, 'pots': args.pots, 'plants': args.plants, 'seed': args.seed,
+        },
+        'routes': {route: summarize(samples[route], elapsed) for route in routes},
+        'total': summarize(all_samples, elapsed),
+    }
+
+
+def print_report(result, baseline=None):
+    print(f"\n{'route':<10} {'req/s':>8} {'errors':>7} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8}  statuses")
+    rows = list(result['routes'].items()) + [('total', result['total'])]
+    for route, stats in rows:
+        latency = stats['latency_ms']
+        print(f"{route:<10} {stats['throughput']:>8.1f} {stats['error_rate']:>7.1%} "
+              f"{latency['p50'] or 0:>8.1f} {latency['p95'] or 0:>8.1f} "
+              f"{latency['p99'] or 0:>8.1f}  {stats['statuses']}")
+
+    if baseline is None:
+        return
+    print("\nChange from baseline (throughput, p95, p99):")
+    base_rows = dict(baseline['routes'], total=baseline['total'])
+    for route, stats in rows:
+        before = base_rows.get(route)
+        if not before or not before['requests'] or not stats['requests']:
+            continue
+        change = lambda new, old: f"{(new - old) / old:+.1%}" if old else 'n/a'
+        print(f"{route:<10} {change(stats['throughput'], before['throughput']):>8} "
+              f"{change(stats['latency_ms']['p95'], before['latency_ms']['p95']):>8} "
+              f"{change(stats['latency_ms']['p99'], before['latency_ms']['p99']):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--users', type=positive_int, default=20)
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='unmeasured seconds first')
+    parser.add_argument('--think-time', type=float, default=100,
+                        help='mean pause between a user\'s requests in ms (0 for none)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='route=weight list')
+    parser.add_argument('--pots', type=positive_int, default=20)
+    parser.add_argument('--plants', type=positive_int, default=40)
+    parser.add_argument('--timeout', type=float, default=30, help='per-request timeout in s')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='result JSON file (default: load-test-<time>.json)')
+    parser.add_argument('--baseline', help='earlier result JSON to compare with')
+    args = parser.parse_args()
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    result = run(args)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    output = args.output or f"load-test-{datetime.now():%Y%m%d-%H%M%S}.json"
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+    sys.exit(0 if result['total']['requests'] else 1)
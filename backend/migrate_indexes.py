@@ -0,0 +1,43 @@
+"""
+Migration script to create indexes declared in models.py that an existing
+database is missing (e.g. pots.room and the open placement lookup index).
+"""
+import os
+from sqlalchemy import create_engine, inspect
+from models import Base
+
+# Database connection
+DATABASE_URL = os.getenv(
+    'DATABASE_URL', 'mysql+pymysql://tracker:trackerpass@db:3306/planttracker')
+
+engine = create_engine(DATABASE_URL)
+
+
+def migrate():
+    print("Creating missing indexes...")
+
+    inspector = inspect(engine)
+    existing_tables = inspector.get_table_names()
+    created = 0
+
+    for table in Base.metadata.sorted_tables:
+        # New tables get their indexes from create_all in app.py
+        if table.name not in existing_tables:
+            continue
+
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            index.create(engine)
+            print(f"Created index '{index.name}' on {table.name}")
+            created += 1
+
+    if created:
+        print(f"Successfully created {created} indexes!")
+    else:
+        print("All indexes already exist. Skipping migration.")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,67 @@
+"""
+Migration script to enforce at most one open placement per plant.
+
+Closes duplicate open plant_pot_history rows (keeping the most recent one) and
+adds the generated 'open_plant_id' column with its unique index.
+"""
+import os
+from sqlalchemy import create_engine, inspect, text
+
+# Database connection
+DATABASE_URL = os.getenv(
+    'DATABASE_URL', 'mysql+pymysql://tracker:trackerpass@db:3306/planttracker')
+
+engine = create_engine(DATABASE_URL)
+
+
+def close_duplicate_open_placements(conn):
+    """Close every open placement except the latest one of each plant"""
+    rows = conn.execute(text("""
+        SELECT id, plant_id, start_date
+        FROM plant_pot_history
+        WHERE end_date IS NULL
+        ORDER BY plant_id, start_date DESC, id DESC
+    """)).fetchall()
+
+    closed = 0
+    latest = {}
+    for row_id, plant_id, start_date in rows:
+        if plant_id not in latest:
+            latest[plant_id] = start_date
+            continue
+        # The superseded placement ends when the latest one started
+        conn.execute(text("""
+            UPDATE plant_pot_history SET end_date = :end_date WHERE id = :id
+        """), {'end_date': latest[plant_id], 'id': row_id})
+        closed += 1
+    return closed
+
+
+def migrate():
+    print("Adding 'open_plant_id' column to plant_pot_history table...")
+
+    columns = [c['name'] for c in inspect(engine).get_columns('plant_pot_history')]
+
+    if 'open_plant_id' in columns:
+        print("Column 'open_plant_id' already exists. Skipping migration.")
+        return
+
+    with engine.connect() as conn:
+        closed = close_duplicate_open_placements(conn)
+        print(f"Closed {closed} duplicate open placements")
+
+        conn.execute(text("""
+            ALTER TABLE plant_pot_history
+            ADD COLUMN open_plant_id INTEGER
+            GENERATED ALWAYS AS (CASE WHEN end_date IS NULL THEN plant_id END) VIRTUAL
+        """))
+        conn.execute(text("""
+            CREATE UNIQUE INDEX uq_plant_pot_history_open_plant_id
+            ON plant_pot_history (open_plant_id)
+        """))
+        conn.commit()
+        print("Successfully added 'open_plant_id' column to plant_pot_history table!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,98 @@
+"""
+Migration script to copy existing QR code images into the QR_STORAGE backend.
+
+Pots created with the default 'local' storage have their images as plain
+files in static/qrcodes. After switching QR_STORAGE to 'content' or
+'database', run this once to import those files into the new backend;
+images the backend already has are left alone. Pots whose image is missing
+from both can be given a freshly rendered one with --regenerate-missing.
+
+Usage: python migrate_qr_storage.py [--source DIR] [--regenerate-missing]
+                                    [--domain URL]
+"""
+import os
+import sys
+import argparse
+from sqlalchemy.orm import sessionmaker
+from database import create_database_engine
+from models import Pot, QRCodeImage
+from qr_storage import (create_qr_storage, parse_qr_filename, qr_filename,
+                        render_qr_code)
+
+# Database connection
+DATABASE_URL = os.getenv(
+    'DATABASE_URL', 'mysql+pymysql://tracker:trackerpass@db:3306/planttracker')
+
+engine = create_database_engine(DATABASE_URL)
+Session = sessionmaker(bind=engine)
+
+# Target backend, configured as for the app
+QR_STORAGE = os.getenv('QR_STORAGE', 'local')
+DEFAULT_QR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'static', 'qrcodes')
+QR_STORAGE_DIR = os.getenv('QR_STORAGE_DIR', DEFAULT_QR_DIR)
+
+
+def import_files(storage, source):
+    """Save every QR image file of source that storage does not have yet"""
+    imported = skipped = 0
+    for filename in sorted(os.listdir(source)):
+        path = os.path.join(source, filename)
+        if not os.path.isfile(path) or not parse_qr_filename(filename):
+            continue
+        if storage.load(filename):
+            skipped += 1
+            continue
+        with open(path, 'rb') as f:
+            storage.save(filename, f.read())
+        imported += 1
+    return imported, skipped
+
+
+def migrate(source, regenerate_missing=False, domain='http://localhost:3000'):
+    print(f"Copying QR code images from {source} into '{QR_STORAGE}' storage...")
+
+    if QR_STORAGE == 'database':
+        QRCodeImage.__table__.create(engine, checkfirst=True)
+    storage = create_qr_storage(QR_STORAGE, QR_STORAGE_DIR, Session)
+
+    if os.path.isdir(source):
+        imported, skipped = import_files(storage, source)
+        print(f"Imported {imported} images, {skipped} were already stored")
+    else:
+        print(f"Source directory {source} does not exist, nothing to import")
+
+    session = Session()
+    try:
+        qr_code_ids = [qr for qr, in session.query(Pot.qr_code_id).order_by(Pot.id)]
+    finally:
+        session.close()
+
+    missing = [qr for qr in qr_code_ids if not storage.load(qr_filename(qr))]
+    if not missing:
+        print(f"All {len(qr_code_ids)} pots have a QR code image")
+        return True
+
+    if not regenerate_missing:
+        print(f"{len(missing)} pots have no QR code image: {', '.join(missing)}")
+        print("Rerun with --regenerate-missing to render them.")
+        return False
+
+    for qr_code_id in missing:
+        storage.save(qr_filename(qr_code_id),
+                     render_qr_code(f"{domain}/pot/{qr_code_id}"))
+    print(f"Rendered {len(missing)} missing QR code images")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', default=DEFAULT_QR_DIR,
+                        help='directory of the existing image files')
+    parser.add_argument('--regenerate-missing', action='store_true',
+                        help='render images for pots that have none')
+    parser.add_argument('--domain', default='http://localhost:3000',
+                        help='frontend URL encoded in regenerated QR codes')
+    args = parser.parse_args()
+
+    sys.exit(0 if migrate(args.source, args.regenerate_missing, args.domain) else 1)
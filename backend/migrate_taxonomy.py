@@ -0,0 +1,141 @@
+"""
+Migration script to move plant taxonomy into the normalized taxa table.
+
+Interns the distinct family/genus/species/species2/variation strings of the
+plants table into taxa, adds the indexed <rank>_id foreign keys to plants,
+fills them in and drops the old string columns.
+
+Plants missing a required family, genus or species cannot get a NOT NULL
+taxon id, so the migration stops before changing the schema when it finds
+any, unless --fill-missing gives a name to store for them instead.
+
+Usage: python migrate_taxonomy.py [--fill-missing NAME]
+"""
+import os
+import sys
+import argparse
+from sqlalchemy import (create_engine, inspect, text, select, update, insert,
+                        or_, func, MetaData, Table)
+from models import Taxon, TAXON_RANKS
+
+# Database connection
+DATABASE_URL = os.getenv(
+    'DATABASE_URL', 'mysql+pymysql://tracker:trackerpass@db:3306/planttracker')
+
+engine = create_engine(DATABASE_URL)
+
+# Ranks every plant must have
+REQUIRED_RANKS = ('family', 'genus', 'species')
+
+
+def intern_existing_names(conn, plants, taxa):
+    """Insert one taxon per distinct non-empty name of each rank"""
+    created = 0
+    for rank in TAXON_RANKS:
+        column = plants.c[rank]
+        names = conn.execute(
+            select(column).where(column.isnot(None), column != '').distinct()
+        ).scalars().all()
+        # One taxon per case-insensitively distinct name, as the name
+        # column's collation compares them
+        known = {name.casefold() for name in conn.execute(
+            select(taxa.c.name).where(taxa.c.rank == rank)).scalars().all()}
+
+        new = []
+        for name in names:
+            if name.casefold() not in known:
+                known.add(name.casefold())
+                new.append({'rank': rank, 'name': name})
+        if new:
+            conn.execute(insert(taxa), new)
+            created += len(new)
+    return created
+
+
+def missing_required_names(conn, plants):
+    """Return {rank: [plant ids]} of plants with an empty required rank"""
+    missing = {}
+    for rank in REQUIRED_RANKS:
+        column = plants.c[rank]
+        plant_ids = conn.execute(
+            select(plants.c.id).where(or_(column.is_(None), func.trim(column) == ''))
+        ).scalars().all()
+        if plant_ids:
+            missing[rank] = plant_ids
+    return missing
+
+
+def add_taxon_columns(conn):
+    """Add the nullable <rank>_id columns, their indexes and foreign keys"""
+    mysql = engine.dialect.name == 'mysql'
+    for rank in TAXON_RANKS:
+        if mysql:
+            conn.execute(text(f"ALTER TABLE plants ADD COLUMN {rank}_id INTEGER NULL"))
+            conn.execute(text(
+                f"ALTER TABLE plants ADD CONSTRAINT fk_plants_{rank}_id "
+                f"FOREIGN KEY ({rank}_id) REFERENCES taxa (id)"))
+        else:
+            conn.execute(text(
+                f"ALTER TABLE plants ADD COLUMN {rank}_id INTEGER REFERENCES taxa (id)"))
+        conn.execute(text(f"CREATE INDEX ix_plants_{rank}_id ON plants ({rank}_id)"))
+
+
+def migrate(fill_missing=None):
+    print("Normalizing plant taxonomy into the taxa table...")
+
+    columns = [c['name'] for c in inspect(engine).get_columns('plants')]
+
+    if 'family_id' in columns:
+        print("Column 'family_id' already exists. Skipping migration.")
+        return True
+
+    # MySQL commits each DDL statement, so check the data before the first one
+    with engine.connect() as conn:
+        plants = Table('plants', MetaData(), autoload_with=conn)
+        missing = missing_required_names(conn, plants)
+        if missing and not fill_missing:
+            for rank, plant_ids in missing.items():
+                print(f"Plants without a {rank}: {plant_ids}")
+            print("Fill these in, or rerun with --fill-missing NAME. Nothing was changed.")
+            return False
+        for rank, plant_ids in missing.items():
+            conn.execute(update(plants).where(plants.c.id.in_(plant_ids))
+                         .values({rank: fill_missing}))
+            print(f"Set {rank} of {len(plant_ids)} plants to '{fill_missing}'")
+        conn.commit()
+
+    Taxon.__table__.create(engine, checkfirst=True)
+
+    with engine.connect() as conn:
+        metadata = MetaData()
+        plants = Table('plants', metadata, autoload_with=conn)
+        taxa = Table('taxa', metadata, autoload_with=conn)
+
+        created = intern_existing_names(conn, plants, taxa)
+        print(f"Interned {created} taxa")
+
+        add_taxon_columns(conn)
+        plants = Table('plants', MetaData(), autoload_with=conn)
+
+        for rank in TAXON_RANKS:
+            taxon_id = select(taxa.c.id).where(
+                taxa.c.rank == rank, taxa.c.name == plants.c[rank]).scalar_subquery()
+            conn.execute(update(plants).values({f'{rank}_id': taxon_id}))
+
+        for rank in TAXON_RANKS:
+            if engine.dialect.name == 'mysql' and rank in REQUIRED_RANKS:
+                conn.execute(text(f"ALTER TABLE plants MODIFY {rank}_id INTEGER NOT NULL"))
+            conn.execute(text(f"ALTER TABLE plants DROP COLUMN {rank}"))
+
+        conn.commit()
+        print("Successfully moved plant taxonomy to the taxa table!")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fill-missing', metavar='NAME',
+                        help="name stored for plants missing a required rank")
+    args = parser.parse_args()
+
+    sys.exit(0 if migrate(args.fill_missing and args.fill_missing.strip()) else 1)
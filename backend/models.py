@@ -1,24 +1,58 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, Date, Boolean, ForeignKey, Enum
+from sqlalchemy import create_engine, Column, Integer, String, Text, Date, Boolean, ForeignKey, Enum, Computed, LargeBinary, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import date
 
 Base = declarative_base()
 
+TAXON_RANKS = ('family', 'genus', 'species', 'species2', 'variation')
+
+
+def case_insensitive_string(length):
+    """String type compared case-insensitively on SQLite too
+
+    MySQL's default collation ignores case in comparisons, unique keys,
+    GROUP BY, DISTINCT and ORDER BY; NOCASE does the same for ASCII on SQLite,
+    so both backends return the same rows.
+    """
+    return String(length).with_variant(String(length, collation='NOCASE'), 'sqlite')
+
+
+class Taxon(Base):
+    __tablename__ = 'taxa'
+    # The unique constraint doubles as the (rank, name) lookup index
+    __table_args__ = (UniqueConstraint('rank', 'name', name='uq_taxa_rank_name'),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    rank = Column(Enum(*TAXON_RANKS, name='taxon_rank', create_constraint=True,
+                       validate_strings=True), nullable=False)
+    name = Column(case_insensitive_string(100), nullable=False)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'rank': self.rank,
+            'name': self.name
+        }
+
 
 class Plant(Base):
     __tablename__ = 'plants'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(100), nullable=False)
-    family = Column(String(100), nullable=False)
-    genus = Column(String(100), nullable=False)
-    species = Column(String(100), nullable=False)
-    species2 = Column(String(100), nullable=True)
-    variation = Column(String(100), nullable=True)
-    size = Column(Enum('seedling', 'small', 'medium', 'large',
-                  'giant', name='plant_size'), nullable=False)
-    status = Column(Enum('active', 'removed', name='plant_status'),
+    name = Column(case_insensitive_string(100), nullable=False)
+    family_id = Column(Integer, ForeignKey('taxa.id'), nullable=False, index=True)
+    genus_id = Column(Integer, ForeignKey('taxa.id'), nullable=False, index=True)
+    species_id = Column(Integer, ForeignKey('taxa.id'), nullable=False, index=True)
+    species2_id = Column(Integer, ForeignKey('taxa.id'), nullable=True, index=True)
+    variation_id = Column(Integer, ForeignKey('taxa.id'), nullable=True, index=True)
+    # create_constraint adds a CHECK on databases without a native ENUM (SQLite)
+    # and validate_strings rejects unknown values before they reach the database
+    size = Column(Enum('seedling', 'small', 'medium', 'large', 'giant',
+                       name='plant_size', create_constraint=True,
+                       validate_strings=True), nullable=False)
+    status = Column(Enum('active', 'removed', name='plant_status',
+                         create_constraint=True, validate_strings=True),
                     default='active', nullable=False)
     removed_reason = Column(String(255), nullable=True)
     date_added = Column(Date, default=date.today, nullable=False)
@@ -27,6 +61,37 @@ class Plant(Base):
     # Relationships
     history = relationship(
         'PlantPotHistory', back_populates='plant', cascade='all, delete-orphan')
+    # Taxa are joined in with the plant so the flat names cost no extra queries
+    family_taxon = relationship(
+        'Taxon', foreign_keys=[family_id], lazy='joined', innerjoin=True)
+    genus_taxon = relationship(
+        'Taxon', foreign_keys=[genus_id], lazy='joined', innerjoin=True)
+    species_taxon = relationship(
+        'Taxon', foreign_keys=[species_id], lazy='joined', innerjoin=True)
+    species2_taxon = relationship(
+        'Taxon', foreign_keys=[species2_id], lazy='joined')
+    variation_taxon = relationship(
+        'Taxon', foreign_keys=[variation_id], lazy='joined')
+
+    @property
+    def family(self):
+        return self.family_taxon.name if self.family_taxon else None
+
+    @property
+    def genus(self):
+        return self.genus_taxon.name if self.genus_taxon else None
+
+    @property
+    def species(self):
+        return self.species_taxon.name if self.species_taxon else None
+
+    @property
+    def species2(self):
+        return self.species2_taxon.name if self.species2_taxon else None
+
+    @property
+    def variation(self):
+        return self.variation_taxon.name if self.variation_taxon else None
 
     def to_dict(self):
         return {
@@ -49,8 +114,8 @@ class Pot(Base):
     __tablename__ = 'pots'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    qr_code_id = Column(String(50), unique=True, nullable=False)
-    room = Column(String(100), nullable=False)
+    qr_code_id = Column(case_insensitive_string(50), unique=True, nullable=False)
+    room = Column(case_insensitive_string(100), nullable=False, index=True)
     size = Column(String(50), nullable=False)
     notes = Column(Text, nullable=True)
     active = Column(Boolean, default=True, nullable=False)
@@ -74,7 +139,7 @@ class Soil(Base):
     __tablename__ = 'soils'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(100), nullable=False)
+    name = Column(case_insensitive_string(100), nullable=False)
     composition = Column(Text, nullable=False)
     active = Column(Boolean, default=True, nullable=False)
 
@@ -92,6 +157,8 @@ class Soil(Base):
 
 class PlantPotHistory(Base):
     __tablename__ = 'plant_pot_history'
+    # Finds the open placements of a set of pots without scanning closed ones
+    __table_args__ = (Index('ix_plant_pot_history_pot_open', 'pot_id', 'end_date'),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     plant_id = Column(Integer, ForeignKey('plants.id'), nullable=False)
@@ -100,6 +167,10 @@ class PlantPotHistory(Base):
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=True)
     notes = Column(Text, nullable=True)
+    # Mirrors plant_id while the placement is open and is NULL once closed, so
+    # the unique index allows at most one open placement per plant
+    open_plant_id = Column(Integer, Computed(
+        'CASE WHEN end_date IS NULL THEN plant_id END'), unique=True)
 
     # Relationships
     plant = relationship('Plant', back_populates='history')
@@ -119,3 +190,11 @@ class PlantPotHistory(Base):
             'pot': self.pot.to_dict() if self.pot else None,
             'soil': self.soil.to_dict() if self.soil else None
         }
+
+
+class QRCodeImage(Base):
+    __tablename__ = 'qr_code_images'
+
+    filename = Column(String(100), primary_key=True)
+    digest = Column(String(64), nullable=False)
+    data = Column(LargeBinary(length=2**24), nullable=False)
@@ -0,0 +1,212 @@
+"""
+QR code rendering and pluggable storage backends.
+
+Images are addressed by filename: '<qr_code_id>.png' is the classic medium
+PNG, other variants are named '<qr_code_id>-<size>.<format>'.
+"""
+import io
+import os
+import re
+import hashlib
+import tempfile
+import itertools
+from collections import namedtuple
+import qrcode
+from models import QRCodeImage
+
+# Module size in pixels for each supported image size
+QR_SIZES = {'small': 4, 'medium': 10, 'large': 20}
+QR_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+DEFAULT_QR_SIZE = 'medium'
+DEFAULT_QR_FORMAT = 'png'
+
+# QR code IDs may themselves contain dashes (e.g. 'POT-001'), so only a known
+# size is treated as a suffix
+_FILENAME_RE = re.compile(
+    r'^(?P<qr_code_id>[A-Za-z0-9-]+?)(?:-(?P<size>%s))?\.(?P<fmt>%s)$'
+    % ('|'.join(QR_SIZES), '|'.join(QR_FORMATS)))
+
+# A stored image is either a file on disk (path) or an in-memory blob (data)
+StoredQRCode = namedtuple('StoredQRCode', ['path', 'data', 'etag', 'mimetype'])
+
+
+def validate_qr_variant(fmt, size):
+    """Raise ValueError for an unsupported format or size"""
+    if fmt not in QR_FORMATS:
+        raise ValueError(f"Unsupported QR format '{fmt}'")
+    if size not in QR_SIZES:
+        raise ValueError(f"Unsupported QR size '{size}'")
+
+
+def qr_filename(qr_code_id, fmt=DEFAULT_QR_FORMAT, size=DEFAULT_QR_SIZE):
+    """Build the storage filename of a QR code variant"""
+    validate_qr_variant(fmt, size)
+    if size == DEFAULT_QR_SIZE:
+        return f"{qr_code_id}.{fmt}"
+    return f"{qr_code_id}-{size}.{fmt}"
+
+
+def parse_qr_filename(filename):
+    """Split a QR filename into (qr_code_id, format, size), or None if invalid"""
+    match = _FILENAME_RE.match(filename)
+    if not match:
+        return None
+    return (match.group('qr_code_id'), match.group('fmt'),
+            match.group('size') or DEFAULT_QR_SIZE)
+
+
+def _render_svg(matrix, box_size):
+    """Encode a module matrix as an SVG drawn in module units
+
+    Each run of dark modules in a row is one stroke of a single path, with
+    integer coordinates in a viewBox of the module grid; width and height
+    scale it, so the markup is the same for every size.
+    """
+    modules = len(matrix)
+    strokes = []
+    for y, row in enumerate(matrix):
+        x, run_end = 0, None
+        for dark, run in itertools.groupby(row):
+            length = len(list(run))
+            if dark:
+                # The first run of a row moves absolutely, the next ones relative
+                # to the end of the previous run
+                strokes.append(f"M{x} {y}.5h{length}" if run_end is None
+                               else f"m{x - run_end} 0h{length}")
+                run_end = x + length
+            x += length
+
+    size = modules * box_size
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+            f'viewBox="0 0 {modules} {modules}" shape-rendering="crispEdges">'
+            f'<path fill="#fff" d="M0 0h{modules}v{modules}H0z"/>'
+            f'<path stroke="#000" d="{"".join(strokes)}"/></svg>').encode()
+
+
+def render_qr_code(url, fmt=DEFAULT_QR_FORMAT, size=DEFAULT_QR_SIZE):
+    """Render a QR code for the URL and return the encoded image bytes"""
+    qr = qrcode.QRCode(version=1, box_size=QR_SIZES[size], border=5)
+    qr.add_data(url)
+    qr.make(fit=True)
+
+    if fmt == 'svg':
+        return _render_svg(qr.get_matrix(), QR_SIZES[size])
+
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer)
+    return buffer.getvalue()
+
+
+def _mimetype(filename):
+    return QR_FORMATS.get(filename.rsplit('.', 1)[-1], 'application/octet-stream')
+
+
+def _atomic_write(path, data):
+    """Write a file so concurrent readers never see a partial image"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+class LocalQRStorage:
+    """Stores each image as a plain file in one directory"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def save(self, filename, data):
+        path = os.path.join(self.directory, filename)
+        _atomic_write(path, data)
+        return path
+
+    def load(self, filename):
+        path = os.path.join(self.directory, filename)
+        if not os.path.isfile(path):
+            return None
+        # The ETag is derived from the file's mtime and size when sent
+        return StoredQRCode(path, None, None, _mimetype(filename))
+
+
+class ContentAddressedQRStorage:
+    """Stores images under their SHA-256 digest, deduplicating identical blobs
+
+    Filenames are resolved through small ref files, so the directory can be a
+    shared volume written by workers on different hosts.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _ref_path(self, filename):
+        return os.path.join(self.directory, 'refs', filename)
+
+    def _object_path(self, digest, filename):
+        ext = filename.rsplit('.', 1)[-1]
+        return os.path.join(self.directory, 'objects', digest[:2], f"{digest}.{ext}")
+
+    def save(self, filename, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest, filename)
+        if not os.path.isfile(path):
+            _atomic_write(path, data)
+        _atomic_write(self._ref_path(filename), digest.encode())
+        return path
+
+    def load(self, filename):
+        try:
+            with open(self._ref_path(filename), 'rb') as f:
+                digest = f.read().decode().strip()
+        except FileNotFoundError:
+            return None
+        path = self._object_path(digest, filename)
+        if not os.path.isfile(path):
+            return None
+        return StoredQRCode(path, None, digest, _mimetype(filename))
+
+
+class DatabaseQRStorage:
+    """Stores images as blobs in the qr_code_images table"""
+
+    def __init__(self, session_factory):
+        self.Session = session_factory
+
+    def save(self, filename, data):
+        session = self.Session()
+        try:
+            image = session.get(QRCodeImage, filename) or QRCodeImage(filename=filename)
+            image.digest = hashlib.sha256(data).hexdigest()
+            image.data = data
+            session.add(image)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def load(self, filename):
+        session = self.Session()
+        try:
+            image = session.get(QRCodeImage, filename)
+            if not image:
+                return None
+            return StoredQRCode(None, image.data, image.digest, _mimetype(filename))
+        finally:
+            session.close()
+
+
+def create_qr_storage(backend, directory, session_factory):
+    """Create the QR storage backend named by the QR_STORAGE setting"""
+    if backend == 'local':
+        return LocalQRStorage(directory)
+    if backend == 'content':
+        return ContentAddressedQRStorage(directory)
+    if backend == 'database':
+        return DatabaseQRStorage(session_factory)
+    raise ValueError(f"Unknown QR storage backend '{backend}'")
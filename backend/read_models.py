@@ -0,0 +1,255 @@
+"""
+Read-only query path for the list endpoints.
+
+Runs SQLAlchemy Core select() statements and maps the plain result rows into
+small __slots__ DTOs instead of ORM instances, skipping the identity map and
+change tracking for data that is only serialized and thrown away. The DTOs
+serialize to the same dicts as the models' to_dict().
+"""
+from sqlalchemy import select, func, and_, or_, exists
+from sqlalchemy.orm import aliased
+from models import Plant, Pot, Soil, PlantPotHistory, Taxon, TAXON_RANKS
+
+_plants = Plant.__table__
+_pots = Pot.__table__
+_soils = Soil.__table__
+_history = PlantPotHistory.__table__
+
+# One alias of the taxa table per rank, joined in to resolve the flat names
+_taxa = {rank: aliased(Taxon.__table__, name=f'{rank}_taxa') for rank in TAXON_RANKS}
+
+_PLANT_COLUMNS = (
+    _plants.c.id, _plants.c.name,
+    *(_taxa[rank].c.name.label(rank) for rank in TAXON_RANKS),
+    _plants.c.size, _plants.c.status, _plants.c.removed_reason,
+    _plants.c.date_added, _plants.c.notes,
+)
+_POT_COLUMNS = (_pots.c.id, _pots.c.qr_code_id, _pots.c.room, _pots.c.size,
+                _pots.c.notes, _pots.c.active)
+_SOIL_COLUMNS = (_soils.c.id, _soils.c.name, _soils.c.composition, _soils.c.active)
+
+
+def _with_taxa(from_clause):
+    """Join the per-rank taxa aliases onto a clause containing plants"""
+    for rank in TAXON_RANKS:
+        from_clause = from_clause.outerjoin(
+            _taxa[rank], _plants.c[f'{rank}_id'] == _taxa[rank].c.id)
+    return from_clause
+
+
+class PlantRow:
+    __slots__ = ('id', 'name', 'family', 'genus', 'species', 'species2',
+                 'variation', 'size', 'status', 'removed_reason', 'date_added',
+                 'notes')
+
+    def __init__(self, row, offset=0):
+        (self.id, self.name, self.family, self.genus, self.species,
+         self.species2, self.variation, self.size, self.status,
+         self.removed_reason, self.date_added, self.notes) = row[offset:offset + 12]
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'family': self.family,
+            'genus': self.genus,
+            'species': self.species,
+            'species2': self.species2,
+            'variation': self.variation,
+            'size': self.size,
+            'status': self.status,
+            'removed_reason': self.removed_reason,
+            'date_added': self.date_added.isoformat() if self.date_added else None,
+            'notes': self.notes
+        }
+
+
+class PotRow:
+    __slots__ = ('id', 'qr_code_id', 'room', 'size', 'notes', 'active')
+
+    def __init__(self, row, offset=0):
+        (self.id, self.qr_code_id, self.room, self.size, self.notes,
+         self.active) = row[offset:offset + 6]
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'qr_code_id': self.qr_code_id,
+            'room': self.room,
+            'size': self.size,
+            'notes': self.notes,
+            'active': self.active
+        }
+
+
+class SoilRow:
+    __slots__ = ('id', 'name', 'composition', 'active')
+
+    def __init__(self, row, offset=0):
+        self.id, self.name, self.composition, self.active = row[offset:offset + 4]
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'composition': self.composition,
+            'active': self.active
+        }
+
+
+class HistoryRow:
+    __slots__ = ('id', 'plant_id', 'pot_id', 'soil_id', 'start_date',
+                 'end_date', 'notes', 'plant', 'pot', 'soil')
+
+    def __init__(self, row, plant, pot, soil):
+        (self.id, self.plant_id, self.pot_id, self.soil_id, self.start_date,
+         self.end_date, self.notes) = row[:7]
+        self.plant = plant
+        self.pot = pot
+        self.soil = soil
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'plant_id': self.plant_id,
+            'pot_id': self.pot_id,
+            'soil_id': self.soil_id,
+            'start_date': self.start_date.isoformat() if self.start_date else None,
+            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'notes': self.notes,
+            'plant': self.plant.to_dict() if self.plant else None,
+            'pot': self.pot.to_dict() if self.pot else None,
+            'soil': self.soil.to_dict() if self.soil else None
+        }
+
+
+def _interned(cache, cls, row, offset):
+    """Build one DTO per id so shared pots, soils and plants serialize once"""
+    entity_id = row[offset]
+    if entity_id is None:
+        return None
+    entity = cache.get(entity_id)
+    if entity is None:
+        entity = cache[entity_id] = cls(row, offset)
+    return entity
+
+
+def list_plants(session, criteria=(), plant_ids=None):
+    """Plants with their current pot and soil: [(PlantRow, PotRow, SoilRow)]"""
+    stmt = select(*_PLANT_COLUMNS).select_from(
+        _with_taxa(_plants)).where(*criteria).order_by(_plants.c.id)
+    if plant_ids is not None:
+        stmt = stmt.where(_plants.c.id.in_(plant_ids))
+    plants = [PlantRow(row) for row in session.execute(stmt)]
+
+    placements = select(_history.c.plant_id, *_POT_COLUMNS, *_SOIL_COLUMNS).select_from(
+        _history.join(_pots, _history.c.pot_id == _pots.c.id)
+                .join(_soils, _history.c.soil_id == _soils.c.id)
+    ).where(_history.c.end_date.is_(None))
+    if criteria:
+        # Filter by the same criteria rather than by an IN list of every
+        # matching plant id, which a large collection could make unbounded
+        placements = placements.join(
+            _plants, _history.c.plant_id == _plants.c.id).where(*criteria)
+    if plant_ids is not None:
+        placements = placements.where(_history.c.plant_id.in_(plant_ids))
+
+    pots, soils, current = {}, {}, {}
+    for row in session.execute(placements):
+        current[row[0]] = (_interned(pots, PotRow, row, 1),
+                           _interned(soils, SoilRow, row, 7))
+
+    return [(plant, *current.get(plant.id, (None, None))) for plant in plants]
+
+
+def list_pots(session, include_inactive=False):
+    """Pots with their open placements: [(PotRow, [(PlantRow, SoilRow, start_date)])]"""
+    stmt = select(*_POT_COLUMNS).order_by(_pots.c.id)
+    if not include_inactive:
+        stmt = stmt.where(_pots.c.active == True)
+    pots = [PotRow(row) for row in session.execute(stmt)]
+
+    placements = select(
+        _history.c.pot_id, _history.c.start_date, *_PLANT_COLUMNS, *_SOIL_COLUMNS
+    ).select_from(
+        _with_taxa(_history.join(_plants, _history.c.plant_id == _plants.c.id))
+        .join(_soils, _history.c.soil_id == _soils.c.id)
+    ).where(_history.c.end_date.is_(None)).order_by(_history.c.id)
+    if not include_inactive:
+        # Skip the placements of inactive pots in SQL instead of loading them
+        placements = placements.join(
+            _pots, _history.c.pot_id == _pots.c.id).where(_pots.c.active == True)
+
+    soil_offset = 2 + len(_PLANT_COLUMNS)
+    soils, current = {}, {}
+    for row in session.execute(placements):
+        current.setdefault(row[0], []).append(
+            (PlantRow(row, 2), _interned(soils, SoilRow, row, soil_offset), row[1]))
+
+    return [(pot, current.get(pot.id, [])) for pot in pots]
+
+
+def list_soils(session, include_inactive=False):
+    """Soil mixes: [SoilRow]"""
+    stmt = select(*_SOIL_COLUMNS)
+    if not include_inactive:
+        stmt = stmt.where(_soils.c.active == True)
+    return [SoilRow(row) for row in session.execute(stmt)]
+
+
+def plant_history(session, plant_id):
+    """A plant's placements, newest first, or None if the plant does not exist"""
+    stmt = select(*_PLANT_COLUMNS).select_from(
+        _with_taxa(_plants)).where(_plants.c.id == plant_id)
+    row = session.execute(stmt).first()
+    if row is None:
+        return None
+    plant = PlantRow(row)
+
+    history_columns = (_history.c.id, _history.c.plant_id, _history.c.pot_id,
+                       _history.c.soil_id, _history.c.start_date,
+                       _history.c.end_date, _history.c.notes)
+    stmt = select(*history_columns, *_POT_COLUMNS, *_SOIL_COLUMNS).select_from(
+        _history.join(_pots, _history.c.pot_id == _pots.c.id)
+                .join(_soils, _history.c.soil_id == _soils.c.id)
+    ).where(_history.c.plant_id == plant_id).order_by(_history.c.start_date.desc())
+
+    pots, soils = {}, {}
+    return [HistoryRow(row, plant, _interned(pots, PotRow, row, 7),
+                       _interned(soils, SoilRow, row, 13))
+            for row in session.execute(stmt)]
+
+
+def pot_summaries(session):
+    """Active pots with their number of current plants, for pot pickers"""
+    stmt = select(
+        _pots.c.id, _pots.c.qr_code_id, _pots.c.room, _pots.c.size,
+        func.count(_history.c.id)
+    ).select_from(
+        _pots.outerjoin(_history, and_(_history.c.pot_id == _pots.c.id,
+                                       _history.c.end_date.is_(None)))
+    ).where(_pots.c.active == True).group_by(*_POT_COLUMNS[:4]).order_by(_pots.c.id)
+
+    return [{'id': pot_id, 'qr_code_id': qr_code_id, 'room': room, 'size': size,
+             'plant_count': plant_count}
+            for pot_id, qr_code_id, room, size, plant_count in session.execute(stmt)]
+
+
+def name_suggestions(session):
+    """Distinct plant names and taxon names per rank, sorted, for autocompletion
+
+    Only taxa some plant still refers to are suggested, not names left behind
+    by renamed or deleted plants.
+    """
+    taxa = Taxon.__table__
+    suggestions = {'name': list(session.execute(
+        select(_plants.c.name).distinct().order_by(_plants.c.name)).scalars())}
+    suggestions.update((rank, []) for rank in TAXON_RANKS)
+    # One EXISTS per rank, each probing that rank's indexed <rank>_id column
+    in_use = or_(*(and_(taxa.c.rank == rank,
+                        exists().where(_plants.c[f'{rank}_id'] == taxa.c.id))
+                   for rank in TAXON_RANKS))
+    for rank, name in session.execute(
+            select(taxa.c.rank, taxa.c.name).where(in_use).order_by(taxa.c.name)):
+        suggestions[rank].append(name)
+    return suggestions
@@ -0,0 +1,132 @@
+"""
+Interned taxonomy names for plants.
+
+Each distinct (rank, name) pair is stored once in the taxa table and plants
+refer to it by id, so taxonomy filters and groupings are integer lookups.
+"""
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+from models import Plant, Taxon, TAXON_RANKS
+
+# Ranks every plant must have
+REQUIRED_RANKS = ('family', 'genus', 'species')
+
+
+def _clean(name):
+    name = (name or '').strip()
+    return name or None
+
+
+def _key(rank, name):
+    # Taxon names are compared case-insensitively, as the name column's
+    # collation does on both MySQL and SQLite
+    return rank, name.casefold()
+
+
+def intern_taxa(session, pairs):
+    """Return {(rank, name): Taxon} for the pairs, creating missing taxa
+
+    Existing taxa are fetched with a single query. A name differing from an
+    existing taxon only in case maps to that taxon and keeps its spelling.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+
+    taxa = session.query(Taxon).filter(
+        Taxon.name.in_({name for _, name in pairs})).all()
+    found = {_key(t.rank, t.name): t for t in taxa}
+
+    interned = {}
+    for rank, name in sorted(pairs):
+        taxon = found.get(_key(rank, name))
+        if taxon is None:
+            # Another request may insert the same taxon concurrently
+            try:
+                with session.begin_nested():
+                    taxon = Taxon(rank=rank, name=name)
+                    session.add(taxon)
+            except IntegrityError:
+                # A locking read sees the row committed by the other request,
+                # which a plain read of a REPEATABLE READ snapshot would not
+                taxon = session.query(Taxon).filter(
+                    Taxon.rank == rank, Taxon.name == name).with_for_update().one()
+            found[_key(rank, name)] = taxon
+        interned[(rank, name)] = taxon
+    return interned
+
+
+def load_taxa(session, plant):
+    """Fill in the taxa of a plant loaded without them, in one query
+
+    Used after locking a plant row: joining the taxa into the locking query
+    would lock the taxa rows shared with every other plant of the same genus.
+    """
+    taxon_ids = {rank: getattr(plant, f'{rank}_id') for rank in TAXON_RANKS}
+    taxa = {t.id: t for t in session.query(Taxon).filter(
+        Taxon.id.in_([i for i in taxon_ids.values() if i is not None])).all()}
+    for rank, taxon_id in taxon_ids.items():
+        set_committed_value(plant, f'{rank}_taxon', taxa.get(taxon_id))
+
+
+def apply_taxonomy(session, plant, data):
+    """Set the plant's taxa from the flat family/genus/... fields in data
+
+    Only ranks present in data are changed; empty optional ranks are cleared.
+    """
+    names = {rank: _clean(data[rank]) for rank in TAXON_RANKS if rank in data}
+    for rank, name in names.items():
+        if name is None and rank in REQUIRED_RANKS:
+            raise ValueError(f"'{rank}' is required")
+
+    interned = intern_taxa(session, [(rank, name) for rank, name in names.items() if name])
+
+    for rank, name in names.items():
+        setattr(plant, f'{rank}_taxon', interned[(rank, name)] if name else None)
+
+
+def taxonomy_criteria(session, args):
+    """Translate ?family=...&genus=... filters into plant id criteria
+
+    Returns a list of filter expressions, or None when a requested name is
+    unknown and no plant can match.
+    """
+    requested = {rank: _clean(args.get(rank)) for rank in TAXON_RANKS}
+    requested = {rank: name for rank, name in requested.items() if name}
+    if not requested:
+        return []
+
+    taxa = session.query(Taxon.rank, Taxon.name, Taxon.id).filter(
+        Taxon.name.in_(requested.values())).all()
+    ids = {_key(rank, name): taxon_id for rank, name, taxon_id in taxa}
+
+    criteria = []
+    for rank, name in requested.items():
+        if _key(rank, name) not in ids:
+            return None
+        criteria.append(getattr(Plant, f'{rank}_id') == ids[_key(rank, name)])
+    return criteria
+
+
+def taxonomy_summary(session, ranks=TAXON_RANKS, prefix=None):
+    """List taxa per rank with the number of plants using each"""
+    query = session.query(Taxon).filter(Taxon.rank.in_(ranks))
+    if prefix:
+        query = query.filter(Taxon.name.like(f'{prefix}%'))
+    taxa = query.order_by(Taxon.name).all()
+
+    counts = {}
+    for rank in ranks:
+        column = getattr(Plant, f'{rank}_id')
+        counts.update(session.query(column, func.count(Plant.id)).filter(
+            column.isnot(None)).group_by(column).all())
+
+    summary = {rank: [] for rank in ranks}
+    for taxon in taxa:
+        summary[taxon.rank].append({
+            'id': taxon.id,
+            'name': taxon.name,
+            'plant_count': counts.get(taxon.id, 0),
+        })
+    return summary
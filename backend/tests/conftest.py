@@ -0,0 +1,30 @@
+"""
+Shared pytest setup: the app runs on in-memory SQLite with QR images in a
+temporary directory, seeded by the same data as check_query_budgets.py.
+"""
+import os
+import sys
+import logging
+import tempfile
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must be set before app.py creates its engine and QR storage
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ['QR_STORAGE_DIR'] = tempfile.mkdtemp(prefix='qrcodes-')
+
+logging.disable(logging.INFO)
+import check_query_budgets  # noqa: E402  (imports app)
+logging.disable(logging.NOTSET)
+
+api = check_query_budgets.api
+api.engine.echo = False
+
+
+@pytest.fixture
+def client():
+    """Test client of the app on a freshly seeded database"""
+    engine = check_query_budgets.use_fresh_database(check_query_budgets.SMALL_SCALE)
+    yield api.app.test_client()
+    engine.dispose()
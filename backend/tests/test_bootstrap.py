@@ -0,0 +1,20 @@
+NEW_PLANT = {'name': 'Elephant Ear', 'family': 'Araceae', 'genus': 'Alocasia',
+             'species': 'macrorrhizos', 'size': 'small'}
+
+
+def genus_suggestions(client):
+    response = client.get('/api/bootstrap?view=add_plant')
+    assert response.status_code == 200
+    return response.get_json()['suggestions']['genus']
+
+
+def test_suggestions_drop_taxa_no_plant_uses(client):
+    plant = client.post('/api/plants', json=NEW_PLANT).get_json()
+    assert 'Alocasia' in genus_suggestions(client)
+
+    response = client.put(f"/api/plants/{plant['id']}", json={'genus': 'Colocasia'})
+    assert response.status_code == 200
+
+    suggestions = genus_suggestions(client)
+    assert 'Colocasia' in suggestions
+    assert 'Alocasia' not in suggestions
@@ -0,0 +1,28 @@
+"""SQLite compares names case-insensitively, as MySQL's default collation does"""
+
+
+def add_pot(client, room):
+    response = client.post('/api/pots', json={'room': room, 'size': '12 cm'})
+    assert response.status_code == 201
+    return response.get_json()
+
+
+def test_rooms_differing_in_case_are_one_room(client):
+    add_pot(client, 'Sunroom')
+    add_pot(client, 'sunroom')
+
+    rooms = [r for r in client.get('/api/rooms').get_json()
+             if r['room'].casefold() == 'sunroom']
+    assert len(rooms) == 1
+    assert rooms[0]['pot_count'] == 2
+
+    response = client.get('/api/rooms/SUNROOM/contents')
+    assert response.status_code == 200
+
+
+def test_qr_code_lookup_ignores_case(client):
+    pot = add_pot(client, 'Hallway')
+
+    response = client.get(f"/api/pots/{pot['qr_code_id'].swapcase()}")
+    assert response.status_code == 200
+    assert response.get_json()['id'] == pot['id']
@@ -0,0 +1,77 @@
+import pytest
+import qr_storage
+from conftest import api
+
+QR_BACKENDS = ('local', 'content', 'database')
+
+
+@pytest.fixture(params=QR_BACKENDS)
+def storage_client(request, client, tmp_path, monkeypatch):
+    """Client whose QR images go to each storage backend in turn"""
+    storage = qr_storage.create_qr_storage(request.param, str(tmp_path), api.Session)
+    monkeypatch.setattr(api, 'qr_storage', storage)
+    return client
+
+
+def add_pot(client, fmt, size):
+    response = client.post('/api/pots', json={
+        'room': 'Test Room', 'size': '12 cm', 'qr_format': fmt, 'qr_size': size})
+    assert response.status_code == 201
+    return response.get_json()['qr_code_path']
+
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip'])
+def test_svg_qr_code_is_compressed(storage_client, encoding):
+    path = add_pot(storage_client, 'svg', 'medium')
+
+    response = storage_client.get(path, headers={'Accept-Encoding': encoding})
+    assert response.status_code == 200
+    assert response.mimetype == 'image/svg+xml'
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Accept-Encoding' in response.vary
+
+    # Revalidating with the (weakened) ETag of the encoded response still works
+    again = storage_client.get(path, headers={
+        'Accept-Encoding': encoding, 'If-None-Match': response.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_svg_qr_code_uncompressed_without_accept_encoding(storage_client):
+    path = add_pot(storage_client, 'svg', 'small')
+
+    response = storage_client.get(path, headers={'Accept-Encoding': 'identity'})
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert response.data.startswith(b'<svg')
+
+
+@pytest.mark.parametrize('size', ['medium', 'large'])
+def test_served_svg_smaller_than_png(client, size):
+    svg = client.get(add_pot(client, 'svg', size), headers={'Accept-Encoding': 'br'})
+    png = client.get(add_pot(client, 'png', size), headers={'Accept-Encoding': 'br'})
+    assert 'Content-Encoding' not in png.headers
+    assert len(svg.data) < len(png.data)
+
+
+@pytest.mark.parametrize('header, with_brotli, without_brotli', [
+    ('br, gzip', 'br', 'gzip'),
+    ('gzip, deflate', 'gzip', 'gzip'),
+    ('*', 'br', 'gzip'),
+    ('', None, None),
+    ('identity', None, None),
+    ('identity;q=0', None, None),
+    ('br;q=0, *', 'gzip', 'gzip'),
+    ('gzip;q=0, *;q=1', 'br', None),
+    ('br;q=0, gzip;q=0, *', None, None),
+    ('*;q=0', None, None),
+    ('*;q=0, gzip', 'gzip', 'gzip'),
+    ('BR;Q=0.5', 'br', None),
+    ('gzip;Q=0, *', 'br', None),
+    ('gzip;q=bogus', None, None),
+])
+def test_choose_encoding(monkeypatch, header, with_brotli, without_brotli):
+    import compression
+    if compression.brotli is not None:
+        assert compression.choose_encoding(header) == with_brotli
+    monkeypatch.setattr(compression, 'brotli', None)
+    assert compression.choose_encoding(header) == without_brotli
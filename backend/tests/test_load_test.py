@@ -0,0 +1,40 @@
+import os
+import sys
+import subprocess
+import pytest
+from load_test import parse_mix
+
+LOAD_TEST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'load_test.py')
+
+
+def test_parse_mix():
+    assert parse_mix('scan=3, move=1,plants') == {'scan': 3, 'move': 1, 'plants': 1}
+    assert parse_mix('scan=1,move=0') == {'scan': 1, 'move': 0}
+
+
+@pytest.mark.parametrize('spec, message', [
+    ('scan=-1,move=2', 'must be zero or positive'),
+    ('scan=nan', 'must be zero or positive'),
+    ('scan=0,move=0', 'at least one route with a positive weight'),
+    ('scan=lots', 'is not a number'),
+    ('delete=1', "Unknown route 'delete'"),
+])
+def test_parse_mix_rejects(spec, message):
+    with pytest.raises(ValueError, match=message):
+        parse_mix(spec)
+
+
+@pytest.mark.parametrize('args, message', [
+    (['--plants', '0'], 'argument --plants: must be at least 1'),
+    (['--pots', '-3'], 'argument --pots: must be at least 1'),
+    (['--users', 'many'], "argument --users: 'many' is not a whole number"),
+    (['--mix', 'scan=0'], 'at least one route with a positive weight'),
+    (['--mix', 'scan=1,move=-1'], "Weight of 'move' must be zero or positive"),
+])
+def test_cli_rejects_invalid_arguments(args, message):
+    # Rejected before any request is sent to the (absent) server
+    result = subprocess.run([sys.executable, LOAD_TEST, '--url', 'http://127.0.0.1:9', *args],
+                            capture_output=True, text=True, timeout=30)
+    assert result.returncode == 2
+    assert message in result.stderr
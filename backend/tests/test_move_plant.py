@@ -0,0 +1,61 @@
+import sqlite3
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from conftest import api
+
+MOVE = {'plant_id': 1, 'pot_id': 3, 'soil_id': 2}
+
+
+@pytest.fixture
+def failing_inserts(client, monkeypatch):
+    """Make placement inserts raise the given IntegrityError messages in turn"""
+    monkeypatch.setattr(api, 'MOVE_RETRY_BACKOFF', 0)
+    engine = api.Session.kw['bind']
+    errors = []
+    attempts = []
+
+    def insert_placement(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO plant_pot_history'):
+            attempts.append(statement)
+            if errors:
+                raise IntegrityError(statement, parameters,
+                                     sqlite3.IntegrityError(errors.pop(0)))
+
+    event.listen(engine, 'before_cursor_execute', insert_placement)
+    yield errors, attempts
+    event.remove(engine, 'before_cursor_execute', insert_placement)
+
+
+def test_move_retries_open_placement_conflicts(client, failing_inserts):
+    errors, attempts = failing_inserts
+    errors.append('UNIQUE constraint failed: plant_pot_history.open_plant_id')
+
+    response = client.post('/api/move', json=MOVE)
+    assert response.status_code == 200
+    assert response.get_json()['current_pot']['id'] == MOVE['pot_id']
+    assert len(attempts) == 2
+
+
+def test_move_gives_up_after_max_attempts(client, failing_inserts):
+    errors, attempts = failing_inserts
+    errors.extend(['UNIQUE constraint failed: plant_pot_history.open_plant_id']
+                  * api.MOVE_MAX_ATTEMPTS)
+
+    response = client.post('/api/move', json=MOVE)
+    assert response.status_code == 409
+    assert len(attempts) == api.MOVE_MAX_ATTEMPTS
+
+
+def test_move_does_not_retry_other_integrity_errors(client, failing_inserts):
+    errors, attempts = failing_inserts
+    errors.append('FOREIGN KEY constraint failed')
+
+    response = client.post('/api/move', json=MOVE)
+    assert response.status_code == 400
+    assert len(attempts) == 1
+
+
+def test_move_rejects_a_non_json_body(client):
+    response = client.post('/api/move', data='plant_id=1', content_type='text/plain')
+    assert response.status_code == 400
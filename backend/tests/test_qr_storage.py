@@ -0,0 +1,43 @@
+import re
+import qrcode
+import pytest
+from qr_storage import QR_SIZES, render_qr_code
+
+URL = 'http://localhost:3000/pot/7ce730f9'
+
+
+def svg_modules(svg):
+    """Decode the dark modules drawn by the stroke path of a QR SVG"""
+    path = re.search(rb'<path stroke="#000" d="([^"]*)"', svg).group(1).decode()
+    dark = set()
+    x = y = 0
+    for command, dx, dy, length in re.findall(r'([Mm])(-?\d+) (\d+)(?:\.5)?h(\d+)', path):
+        if command == 'M':
+            x, y = int(dx), int(dy)
+        else:
+            x += int(dx)
+        dark.update((x + i, y) for i in range(int(length)))
+        x += int(length)
+    return dark
+
+
+@pytest.mark.parametrize('size', QR_SIZES)
+def test_svg_draws_the_qr_matrix(size):
+    qr = qrcode.QRCode(version=1, box_size=QR_SIZES[size], border=5)
+    qr.add_data(URL)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+
+    expected = {(x, y) for y, row in enumerate(matrix) for x, on in enumerate(row) if on}
+    svg = render_qr_code(URL, 'svg', size)
+    assert svg_modules(svg) == expected
+    assert f'viewBox="0 0 {len(matrix)} {len(matrix)}"'.encode() in svg
+    assert f'width="{len(matrix) * QR_SIZES[size]}"'.encode() in svg
+
+
+@pytest.mark.parametrize('size', QR_SIZES)
+def test_svg_is_compact(size):
+    svg = render_qr_code(URL, 'svg', size)
+    # Only width and height depend on the size; the markup is in module units
+    assert len(svg) == len(render_qr_code(URL, 'svg', 'medium'))
+    assert len(svg) < 2 * 1024
@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import event
+from conftest import api
+
+PLANTS = 40
+
+
+@pytest.fixture
+def philodendrons(client):
+    """A pot holding PLANTS plants of one genus, placed through the API"""
+    pot = client.post('/api/pots', json={'room': 'Greenhouse', 'size': '30 cm'}).get_json()
+    soil = client.post('/api/soils', json={'name': 'Aroid Mix', 'composition': 'bark'}).get_json()
+    plant_ids = []
+    for i in range(PLANTS):
+        plant = client.post('/api/plants', json={
+            'name': f'Philodendron {i}', 'family': 'Araceae', 'genus': 'Philodendron',
+            'species': 'hederaceum', 'size': 'small'}).get_json()
+        client.post('/api/move', json={
+            'plant_id': plant['id'], 'pot_id': pot['id'], 'soil_id': soil['id']})
+        plant_ids.append(plant['id'])
+    return pot, plant_ids
+
+
+@pytest.fixture
+def statements():
+    """Parameters of the SQL statements run while the test sends requests"""
+    engine = api.Session.kw['bind']
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(parameters)
+
+    event.listen(engine, 'before_cursor_execute', capture)
+    yield captured
+    event.remove(engine, 'before_cursor_execute', capture)
+
+
+def test_filtered_plant_list_binds_no_id_list(client, philodendrons, statements):
+    pot, plant_ids = philodendrons
+
+    plants = client.get('/api/plants?genus=Philodendron').get_json()
+
+    assert [p['id'] for p in plants] == plant_ids
+    assert all(p['current_pot']['id'] == pot['id'] for p in plants)
+    assert max(len(parameters) for parameters in statements) < PLANTS
+
+
+def test_pot_list_binds_no_id_list(client, philodendrons, statements):
+    pot, plant_ids = philodendrons
+
+    pots = {p['id']: p for p in client.get('/api/pots').get_json()}
+
+    assert [p['id'] for p in pots[pot['id']]['current_plants']] == plant_ids
+    assert max(len(parameters) for parameters in statements) < PLANTS
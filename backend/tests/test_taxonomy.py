@@ -0,0 +1,59 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from models import Base, Taxon
+from taxonomy import intern_taxa
+from conftest import api
+
+NEW_PLANT = {'name': 'Cutting', 'family': 'Araceae', 'genus': 'Monstera',
+             'species': 'adansonii', 'size': 'small'}
+
+
+def genus_taxa(name):
+    session = api.Session()
+    try:
+        return session.query(Taxon).filter(
+            Taxon.rank == 'genus', Taxon.name == name).all()
+    finally:
+        session.close()
+
+
+def test_names_differing_in_case_share_a_taxon(client):
+    first = client.post('/api/plants', json=NEW_PLANT).get_json()
+    second = client.post('/api/plants', json=dict(NEW_PLANT, genus='MONSTERA')).get_json()
+
+    assert second['genus'] == first['genus'] == 'Monstera'
+    assert len(genus_taxa('monstera')) == 1
+
+
+def test_taxonomy_filter_ignores_case(client):
+    plant = client.post('/api/plants', json=dict(NEW_PLANT, genus='Rhaphidophora')).get_json()
+
+    response = client.get('/api/plants?genus=rhaphidophora')
+    assert response.status_code == 200
+    assert [p['id'] for p in response.get_json()] == [plant['id']]
+
+
+def test_intern_taxa_reuses_a_concurrently_inserted_taxon(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'taxa.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    @event.listens_for(session, 'do_orm_execute', once=True)
+    def insert_concurrently(orm_execute_state):
+        # Another request commits the taxon right after the lookup
+        result = orm_execute_state.invoke_statement()
+        other = Session()
+        other.add(Taxon(rank='genus', name='Epipremnum'))
+        other.commit()
+        other.close()
+        return result
+
+    try:
+        interned = intern_taxa(session, [('genus', 'epipremnum')])
+        session.commit()
+        assert interned[('genus', 'epipremnum')].name == 'Epipremnum'
+        assert session.query(Taxon).count() == 1
+    finally:
+        session.close()
+        engine.dispose()
@@ -1,18 +1,18 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { plantAPI, potAPI, soilAPI, historyAPI } from '../services/api';
-import { Pot, Soil, Plant } from '../types';
+import { plantAPI, potAPI, historyAPI, bootstrapAPI } from '../services/api';
+import { Pot, PotSummary, Soil, NameSuggestions } from '../types';
 import CustomSelect from '../components/CustomSelect';
 import AutocompleteInput from '../components/AutocompleteInput';
 
 const AddPlantForm: React.FC = () => {
     const navigate = useNavigate();
-    const [pots, setPots] = useState<Pot[]>([]);
+    const [pots, setPots] = useState<PotSummary[]>([]);
     const [soils, setSoils] = useState<Soil[]>([]);
-    const [plants, setPlants] = useState<Plant[]>([]);
+    const [suggestions, setSuggestions] = useState<Partial<NameSuggestions>>({});
     const [potQR, setPotQR] = useState('');
     const [selectedPot, setSelectedPot] = useState<Pot | null>(null);
-    const [filteredPots, setFilteredPots] = useState<Pot[]>([]);
+    const [filteredPots, setFilteredPots] = useState<PotSummary[]>([]);
     const [formData, setFormData] = useState({
         name: '',
         family: '',
@@ -29,13 +29,8 @@ const AddPlantForm: React.FC = () => {
     const [loading, setLoading] = useState(false);
     const [error, setError] = useState<string | null>(null);
 
-    // Get unique values for autocomplete suggestions
-    const getUniqueSuggestions = (field: keyof Plant): string[] => {
-        const values = plants
-            .map(plant => plant[field])
-            .filter((value): value is string => typeof value === 'string' && value.trim() !== '');
-        return [...new Set(values)].sort();
-    };
+    // Autocomplete suggestions come pre-sorted and de-duplicated from the server
+    const getUniqueSuggestions = (field: keyof NameSuggestions): string[] => suggestions[field] || [];
 
     useEffect(() => {
         fetchData();
@@ -43,14 +38,10 @@ const AddPlantForm: React.FC = () => {
 
     const fetchData = async () => {
         try {
-            const [potsRes, soilsRes, plantsRes] = await Promise.all([
-                potAPI.getAll(),
-                soilAPI.getAll(),
-                plantAPI.getAll()
-            ]);
-            setPots(potsRes.data);
-            setSoils(soilsRes.data);
-            setPlants(plantsRes.data);
+            const response = await bootstrapAPI.addPlant();
+            setPots(response.data.pots);
+            setSoils(response.data.soils);
+            setSuggestions(response.data.suggestions);
         } catch (err) {
             setError('Failed to fetch data');
             console.error(err);
@@ -283,9 +274,9 @@ const AddPlantForm: React.FC = () => {
                                     <div className="font-medium">📦 QR: {pot.qr_code_id}</div>
                                     <div className="text-sm text-gray-600">
                                         {pot.room} - {pot.size}
-                                        {pot.current_plants && pot.current_plants.length > 0 && (
+                                        {pot.plant_count > 0 && (
                                             <span className="text-blue-600 font-semibold">
-                                                {' '}• {pot.current_plants.length} plant{pot.current_plants.length !== 1 ? 's' : ''}
+                                                {' '}• {pot.plant_count} plant{pot.plant_count !== 1 ? 's' : ''}
                                             </span>
                                         )}
                                     </div>
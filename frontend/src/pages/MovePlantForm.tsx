@@ -1,20 +1,20 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { potAPI, soilAPI, historyAPI, plantAPI } from '../services/api';
-import { Pot, Soil } from '../types';
+import { potAPI, historyAPI, plantAPI, bootstrapAPI } from '../services/api';
+import { Pot, PotSummary, Soil } from '../types';
 import CustomSelect from '../components/CustomSelect';
 
 const MovePlantForm: React.FC = () => {
     const navigate = useNavigate();
-    const [pots, setPots] = useState<Pot[]>([]);
+    const [pots, setPots] = useState<PotSummary[]>([]);
     const [soils, setSoils] = useState<Soil[]>([]);
     const [sourcePotQR, setSourcePotQR] = useState('');
     const [destPotQR, setDestPotQR] = useState('');
     const [sourcePot, setSourcePot] = useState<Pot | null>(null);
     const [destPot, setDestPot] = useState<Pot | null>(null);
     const [selectedPlantId, setSelectedPlantId] = useState<number | null>(null);
-    const [filteredSourcePots, setFilteredSourcePots] = useState<Pot[]>([]);
-    const [filteredDestPots, setFilteredDestPots] = useState<Pot[]>([]);
+    const [filteredSourcePots, setFilteredSourcePots] = useState<PotSummary[]>([]);
+    const [filteredDestPots, setFilteredDestPots] = useState<PotSummary[]>([]);
     const [isArchiving, setIsArchiving] = useState(false);
     const [removeReason, setRemoveReason] = useState('');
     const [formData, setFormData] = useState({
@@ -31,12 +31,9 @@ const MovePlantForm: React.FC = () => {
 
     const fetchData = async () => {
         try {
-            const [potsRes, soilsRes] = await Promise.all([
-                potAPI.getAll(),
-                soilAPI.getAll(),
-            ]);
-            setPots(potsRes.data);
-            setSoils(soilsRes.data);
+            const response = await bootstrapAPI.movePlant();
+            setPots(response.data.pots);
+            setSoils(response.data.soils);
         } catch (err) {
             setError('Failed to fetch data');
             console.error(err);
@@ -229,9 +226,9 @@ const MovePlantForm: React.FC = () => {
                                     <div className="font-medium">📦 QR: {pot.qr_code_id}</div>
                                     <div className="text-sm text-gray-600">
                                         {pot.room} - {pot.size}
-                                        {pot.current_plants && pot.current_plants.length > 0 && (
+                                        {pot.plant_count > 0 && (
                                             <span className="text-blue-600 font-semibold">
-                                                {' '}• {pot.current_plants.length} plant{pot.current_plants.length !== 1 ? 's' : ''}
+                                                {' '}• {pot.plant_count} plant{pot.plant_count !== 1 ? 's' : ''}
                                             </span>
                                         )}
                                     </div>
@@ -406,9 +403,9 @@ const MovePlantForm: React.FC = () => {
                                         <div className="font-medium">📦 QR: {pot.qr_code_id}</div>
                                         <div className="text-sm text-gray-600">
                                             {pot.room} - {pot.size}
-                                            {pot.current_plants && pot.current_plants.length > 0 ? (
+                                            {pot.plant_count > 0 ? (
                                                 <span className="text-blue-600 font-semibold">
-                                                    {' '}• {pot.current_plants.length} plant{pot.current_plants.length !== 1 ? 's' : ''}
+                                                    {' '}• {pot.plant_count} plant{pot.plant_count !== 1 ? 's' : ''}
                                                 </span>
                                             ) : (
                                                 <span className="text-gray-500"> • Empty</span>
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Plant, Pot, Soil, PlantPotHistory, MoveRequest } from '../types';
+import { Plant, Pot, Soil, PlantPotHistory, MoveRequest, PlantListV2, PotListV2, Taxonomy, TaxonRank, RoomSummary, RoomContents, AddPlantBootstrap, MovePlantBootstrap } from '../types';
 
 const API_BASE_URL = '/api';
 
@@ -13,7 +13,9 @@ const api = axios.create({
 // Plant API
 export const plantAPI = {
     getAll: () => api.get<Plant[]>('/plants'),
+    getAllCompact: () => api.get<PlantListV2>('/v2/plants'),
     getById: (id: number) => api.get<Plant>(`/plants/${id}`),
+    getByIds: (ids: number[]) => api.get<Plant[]>('/plants', { params: { ids: ids.join(',') } }),
     create: (plant: Partial<Plant>) => api.post<Plant>('/plants', plant),
     update: (id: number, plant: Partial<Plant>) => api.put<Plant>(`/plants/${id}`, plant),
     remove: (id: number, reason: string) => api.delete<Plant>(`/plants/${id}`, { data: { removed_reason: reason } }),
@@ -22,12 +24,22 @@ export const plantAPI = {
 // Pot API
 export const potAPI = {
     getAll: (includeInactive: boolean = false) => api.get<Pot[]>('/pots', { params: { include_inactive: includeInactive } }),
+    getAllCompact: (includeInactive: boolean = false) => api.get<PotListV2>('/v2/pots', { params: { include_inactive: includeInactive } }),
     getByQRCode: (qrCodeId: string) => api.get<Pot>(`/pots/${qrCodeId}`),
+    getByQRCodes: (qrCodeIds: string[]) => api.get<Pot[]>('/pots/batch', { params: { qr: qrCodeIds.join(',') } }),
+    getByIds: (ids: number[]) => api.get<Pot[]>('/pots/batch', { params: { ids: ids.join(',') } }),
     create: (pot: Partial<Pot>) => api.post<Pot>('/pots', pot),
     update: (id: number, pot: Partial<Pot>) => api.put<Pot>(`/pots/${id}`, pot),
     delete: (id: number) => api.delete(`/pots/${id}`),
 };
 
+// Room API
+export const roomAPI = {
+    getAll: (includeInactive: boolean = false) => api.get<RoomSummary[]>('/rooms', { params: { include_inactive: includeInactive } }),
+    getContents: (room: string, includeInactive: boolean = false) =>
+        api.get<RoomContents>(`/rooms/${encodeURIComponent(room)}/contents`, { params: { include_inactive: includeInactive } }),
+};
+
 // Soil API
 export const soilAPI = {
     getAll: (includeInactive: boolean = false) => api.get<Soil[]>('/soils', { params: { include_inactive: includeInactive } }),
@@ -41,3 +53,15 @@ export const historyAPI = {
     getPlantHistory: (plantId: number) => api.get<PlantPotHistory[]>(`/history/${plantId}`),
     movePlant: (moveRequest: MoveRequest) => api.post<Plant>('/move', moveRequest),
 };
+
+// Taxonomy API
+export const taxonomyAPI = {
+    getAll: () => api.get<Taxonomy>('/taxonomy'),
+    getRank: (rank: TaxonRank, prefix?: string) => api.get<Taxonomy>('/taxonomy', { params: { rank, prefix } }),
+};
+
+// Form bootstrap API: one revalidated request per form page
+export const bootstrapAPI = {
+    addPlant: () => api.get<AddPlantBootstrap>('/bootstrap', { params: { view: 'add_plant' } }),
+    movePlant: () => api.get<MovePlantBootstrap>('/bootstrap', { params: { view: 'move_plant' } }),
+};
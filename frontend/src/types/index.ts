@@ -49,6 +49,62 @@ export interface PlantPotHistory {
     soil?: Soil;
 }
 
+export interface RoomSummary {
+    room: string;
+    pot_count: number;
+    plant_count: number;
+}
+
+export interface RoomContents {
+    room: string;
+    pots: Pot[];
+}
+
+export type TaxonRank = 'family' | 'genus' | 'species' | 'species2' | 'variation';
+
+export interface TaxonSummary {
+    id: number;
+    name: string;
+    plant_count: number;
+}
+
+export type Taxonomy = Partial<Record<TaxonRank, TaxonSummary[]>>;
+
+// Normalized v2 list payloads: referenced entities are sent once
+export interface PlantListV2 {
+    plants: (Plant & { current_pot_id: number | null; current_soil_id: number | null })[];
+    pots: Pot[];
+    soils: Soil[];
+}
+
+export interface PotListV2 {
+    pots: (Pot & { current_plant_ids: number[]; current_soil_id: number | null })[];
+    plants: Plant[];
+    soils: Soil[];
+}
+
+// Reference data for the form pages (/api/bootstrap)
+export interface PotSummary {
+    id: number;
+    qr_code_id: string;
+    room: string;
+    size: string;
+    plant_count: number;
+}
+
+export type NameSuggestions = Record<'name' | TaxonRank, string[]>;
+
+export interface AddPlantBootstrap {
+    pots: PotSummary[];
+    soils: Soil[];
+    suggestions: NameSuggestions;
+}
+
+export interface MovePlantBootstrap {
+    pots: PotSummary[];
+    soils: Soil[];
+}
+
 export interface MoveRequest {
     plant_id: number;
     pot_id: number;